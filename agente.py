@@ -2,18 +2,62 @@
 Agente de Disponibilidad de Servicios con LangGraph
 Consulta servicios, promesas y afectaciones en SQL Server
 """
-import os
-from typing import TypedDict, Annotated, Sequence
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from collections import OrderedDict, deque
+from datetime import date
+from typing import TYPE_CHECKING, TypedDict, Annotated, AsyncIterator, Sequence
 from operator import add
+import httpx
 import tools as ts
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
-from dotenv import load_dotenv
+from langgraph.types import Send
+from enrutador import enrutar, sin_datos
+from settings import get_settings
 
-# Cargar variables de entorno
-load_dotenv()
+if TYPE_CHECKING:
+    # numpy solo se importa en tiempo de ejecución si la caché semántica lo usa
+    import numpy as np
+
+settings = get_settings()
+
+
+# ==================== LOGGING ====================
+
+logger = logging.getLogger("agente")
+
+
+def _configurar_logging():
+    """
+    Envía los logs del agente a stdout desde un hilo de fondo: quien loguea
+    solo encola el registro y no espera la escritura en consola.
+    """
+    cola = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(cola, logging.StreamHandler(sys.stdout))
+    
+    logger.addHandler(logging.handlers.QueueHandler(cola))
+    logger.setLevel(settings.log_level)
+    logger.propagate = False
+    
+    listener.start()
+    atexit.register(listener.stop)
+
+
+_configurar_logging()
+
+
+def _nivel_traza(verbose: bool) -> int:
+    """Nivel de la traza paso a paso: INFO con verbose, DEBUG sin él"""
+    return logging.INFO if verbose else logging.DEBUG
 
 # ==================== ESTADO DEL GRAFO ====================
 
@@ -24,12 +68,15 @@ class AgentState(TypedDict):
 
 # ==================== CONFIGURACIÓN DEL LLM ====================
 
-model_name = os.getenv('OPENAI_MODEL', 'gpt-4-turbo')
+# Clientes HTTP/2 con conexiones keep-alive, reutilizados entre llamadas
+http_limits = httpx.Limits(max_keepalive_connections=20)
 
 llm = ChatOpenAI(
-    model=model_name,
-    api_key=os.getenv('OPENAI_API_KEY'),
-    temperature=0
+    model=settings.openai_model,
+    api_key=settings.openai_api_key,
+    temperature=0,
+    http_client=httpx.Client(http2=True, limits=http_limits),
+    http_async_client=httpx.AsyncClient(http2=True, limits=http_limits)
 )
 
 tools = [
@@ -51,14 +98,25 @@ def llamar_modelo(state: AgentState):
     return {"messages": [response]}
 
 
+async def llamar_modelo_async(state: AgentState):
+    """Versión asíncrona de llamar_modelo, usada por consultar_agente_async"""
+    messages = state['messages']
+    response = await llm_with_tools.ainvoke(messages)
+    return {"messages": [response]}
+
+
 def decidir_continuar(state: AgentState):
     """Decide si continuar ejecutando herramientas o terminar"""
     messages = state['messages']
     last_message = messages[-1]
     
-    # Si el último mensaje tiene tool_calls, continuar a las herramientas
+    # Si el último mensaje tiene tool_calls, enviar cada una como tarea
+    # independiente al nodo de herramientas para que se ejecuten en paralelo
     if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-        return "tools"
+        return [
+            Send("tools", {"messages": [last_message.model_copy(update={"tool_calls": [tool_call]})]})
+            for tool_call in last_message.tool_calls
+        ]
     # Si no, terminar
     return "end"
 
@@ -68,7 +126,7 @@ def decidir_continuar(state: AgentState):
 workflow = StateGraph(AgentState)
 
 # Agregar nodos
-workflow.add_node("agent", llamar_modelo)
+workflow.add_node("agent", RunnableLambda(llamar_modelo, afunc=llamar_modelo_async))
 workflow.add_node("tools", ToolNode(tools))
 
 # Configurar punto de entrada
@@ -90,9 +148,192 @@ workflow.add_edge("tools", "agent")
 # Compilar el grafo
 app = workflow.compile()
 
+# Precalentamiento: abre la conexión con OpenAI (TLS incluido) y serializa
+# el esquema de las herramientas antes de la primera pregunta
+if settings.prewarm:
+    try:
+        llm_with_tools.invoke([HumanMessage(content="ping")])
+    except Exception:
+        pass
+
+
+# ==================== ENRUTADOR ====================
+
+# Herramientas por nombre, para las preguntas que resuelve el enrutador
+herramientas_por_nombre = {herramienta.name: herramienta for herramienta in tools}
+
+
+def _enrutar(pregunta: str):
+    """
+    Busca una herramienta que responda la pregunta sin consultar al LLM.
+    
+    Si la herramienta no encuentra datos (ver enrutador.sin_datos), quien
+    llama sigue con el LLM.
+    
+    Returns:
+        Tupla (herramienta, argumentos), o None si la pregunta debe ir al LLM
+    """
+    ruta = enrutar(pregunta)
+    if ruta is None:
+        return None
+    
+    nombre, argumentos = ruta
+    return herramientas_por_nombre[nombre], argumentos
+
+
+# ==================== CACHÉ DE RESPUESTAS ====================
+
+# Las respuestas vencen tras este tiempo: una afectación registrada después
+# de guardarlas cambia la disponibilidad
+CACHE_TTL_SEGUNDOS = settings.cache_ttl_minutos * 60
+
+# Caché exacta: pregunta normalizada -> (momento de guardado, respuesta)
+CACHE_MAX_ENTRADAS = 512
+_cache_respuestas = OrderedDict()
+
+# Caché semántica (opcional): reutiliza respuestas de preguntas parecidas.
+# Entradas (fecha, momento de guardado, embedding, respuesta) en orden de guardado
+UMBRAL_SIMILITUD = 0.95
+_cache_semantico = deque(maxlen=CACHE_MAX_ENTRADAS)
+
+embeddings = OpenAIEmbeddings(
+    model='text-embedding-3-small',
+    api_key=settings.openai_api_key
+) if settings.semantic_cache else None
+
+
+def _clave_cache(pregunta: str) -> tuple:
+    """
+    Clave de la caché exacta.
+    
+    Incluye la fecha de hoy: las herramientas usan rangos por defecto que
+    terminan en la fecha actual, así que una respuesta solo vale para el día
+    en que se generó.
+    """
+    return (" ".join(pregunta.lower().split()), date.today())
+
+
+def _vencida(guardado: float) -> bool:
+    """Indica si una entrada guardada en ese momento (time.monotonic) ya venció"""
+    return time.monotonic() - guardado >= CACHE_TTL_SEGUNDOS
+
+
+def _normalizar(vector) -> "np.ndarray":
+    """Normaliza un embedding para comparar por similitud coseno con un producto punto"""
+    import numpy as np
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+def _buscar_en_cache(clave: tuple, vector: "np.ndarray" = None) -> str:
+    """
+    Busca una respuesta en caché: primero exacta y, si se pasa el embedding
+    de la pregunta, por similitud semántica entre las respuestas del día.
+    Las entradas vencidas se descartan.
+    
+    Returns:
+        Respuesta en caché, o None si no hay coincidencia
+    """
+    if clave in _cache_respuestas:
+        guardado, respuesta = _cache_respuestas[clave]
+        if not _vencida(guardado):
+            _cache_respuestas.move_to_end(clave)
+            return respuesta
+        del _cache_respuestas[clave]
+    
+    if vector is not None:
+        import numpy as np
+        
+        # Las entradas están en orden de guardado: las vencidas quedan al inicio
+        while _cache_semantico and _vencida(_cache_semantico[0][1]):
+            _cache_semantico.popleft()
+        
+        candidatos = [(vec, resp) for fecha, _, vec, resp in _cache_semantico if fecha == clave[1]]
+        if candidatos:
+            similitudes = np.stack([vec for vec, _ in candidatos]) @ vector
+            mejor = int(np.argmax(similitudes))
+            if similitudes[mejor] >= UMBRAL_SIMILITUD:
+                return candidatos[mejor][1]
+    
+    return None
+
+
+def _guardar_en_cache(clave: tuple, respuesta: str, vector: "np.ndarray" = None):
+    """Guarda una respuesta en la caché exacta y, si hay embedding, en la semántica"""
+    if CACHE_TTL_SEGUNDOS <= 0:
+        return
+    
+    guardado = time.monotonic()
+    _cache_respuestas[clave] = (guardado, respuesta)
+    _cache_respuestas.move_to_end(clave)
+    if len(_cache_respuestas) > CACHE_MAX_ENTRADAS:
+        _cache_respuestas.popitem(last=False)
+    
+    if vector is not None:
+        _cache_semantico.append((clave[1], guardado, vector, respuesta))
+
+
+def limpiar_cache():
+    """Vacía las cachés de respuestas"""
+    _cache_respuestas.clear()
+    _cache_semantico.clear()
+
 
 # ==================== FUNCIÓN PRINCIPAL ====================
 
+def _procesar_paso(output: dict, step_count: int, verbose: bool) -> str:
+    """
+    Procesa un paso del stream del grafo.
+    
+    Returns:
+        Contenido de texto del agente en este paso, o cadena vacía si no hay
+    """
+    contenido = ""
+    nivel = _nivel_traza(verbose)
+    trazar = logger.isEnabledFor(nivel)
+    
+    if trazar:
+        logger.log(nivel, "\n%s", '='*60)
+        logger.log(nivel, "Paso %d: %s", step_count, list(output.keys()))
+        logger.log(nivel, "%s", '='*60)
+    
+    for key, value in output.items():
+        if key == "agent":
+            last_msg = value['messages'][-1]
+            if trazar:
+                logger.log(nivel, "🤖 Tipo de mensaje: %s", type(last_msg).__name__)
+                if hasattr(last_msg, 'tool_calls'):
+                    logger.log(nivel, "   Tool calls: %d", len(last_msg.tool_calls) if last_msg.tool_calls else 0)
+            
+            # Solo capturar el contenido si es un mensaje de texto (no tool calls)
+            if hasattr(last_msg, 'content') and last_msg.content and isinstance(last_msg.content, str):
+                contenido = last_msg.content
+                if trazar:
+                    logger.log(nivel, "   Contenido: %s...", contenido[:100])
+                    
+        elif key == "tools":
+            if trazar:
+                logger.log(nivel, "🔧 Ejecutando %d herramienta(s)...", len(value['messages']))
+                for msg in value['messages']:
+                    if isinstance(msg, ToolMessage):
+                        logger.log(nivel, "   - Herramienta ejecutada: %s", msg.name if hasattr(msg, 'name') else 'N/A')
+    
+    return contenido
+
+
+def _mensaje_error(e: Exception) -> str:
+    """Convierte una excepción del grafo en un mensaje para el usuario"""
+    error_msg = str(e)
+    logger.error("\n❌ Error completo: %s", error_msg)
+    
+    if "tool" in error_msg.lower() and "role" in error_msg.lower():
+        return (
+            "❌ Error: Problema con el manejo de herramientas. "
+            f"Detalles técnicos: {error_msg}"
+        )
+    return f"❌ Error al procesar la consulta: {error_msg}"
+
+
 def consultar_agente(pregunta: str, verbose: bool = False) -> str:
     """
     Procesa una pregunta sobre disponibilidad de servicios.
@@ -104,56 +345,188 @@ def consultar_agente(pregunta: str, verbose: bool = False) -> str:
     Returns:
         Respuesta del agente
     """
+    ruta = _enrutar(pregunta)
+    if ruta is not None:
+        herramienta, argumentos = ruta
+        respuesta = herramienta.invoke(argumentos)
+        if not sin_datos(respuesta):
+            logger.log(_nivel_traza(verbose), "🧭 Respondida sin LLM con: %s", herramienta.name)
+            return respuesta
+        logger.log(_nivel_traza(verbose), "🧭 %s no encontró datos, se consulta al LLM", herramienta.name)
+    
+    clave = _clave_cache(pregunta)
+    respuesta = _buscar_en_cache(clave)
+    if respuesta is not None:
+        logger.log(_nivel_traza(verbose), "💾 Respuesta obtenida de la caché")
+        return respuesta
+    
     inputs = {"messages": [HumanMessage(content=pregunta)]}
     
     resultado = ""
     step_count = 0
     
     try:
+        vector = None
+        if embeddings is not None:
+            vector = _normalizar(embeddings.embed_query(pregunta))
+            respuesta = _buscar_en_cache(clave, vector)
+            if respuesta is not None:
+                logger.log(_nivel_traza(verbose), "💾 Respuesta obtenida de la caché semántica")
+                return respuesta
+        
         for output in app.stream(inputs):
             step_count += 1
-            
-            if verbose:
-                print(f"\n{'='*60}")
-                print(f"Paso {step_count}: {list(output.keys())}")
-                print(f"{'='*60}")
-            
-            for key, value in output.items():
-                if key == "agent":
-                    last_msg = value['messages'][-1]
-                    if verbose:
-                        print(f"🤖 Tipo de mensaje: {type(last_msg).__name__}")
-                        if hasattr(last_msg, 'tool_calls'):
-                            print(f"   Tool calls: {len(last_msg.tool_calls) if last_msg.tool_calls else 0}")
-                    
-                    # Solo capturar el contenido si es un mensaje de texto (no tool calls)
-                    if hasattr(last_msg, 'content') and last_msg.content and isinstance(last_msg.content, str):
-                        resultado = last_msg.content
-                        if verbose:
-                            print(f"   Contenido: {resultado[:100]}...")
-                            
-                elif key == "tools":
-                    if verbose:
-                        print(f"🔧 Ejecutando {len(value['messages'])} herramienta(s)...")
-                        for msg in value['messages']:
-                            if isinstance(msg, ToolMessage):
-                                print(f"   - Herramienta ejecutada: {msg.name if hasattr(msg, 'name') else 'N/A'}")
+            resultado = _procesar_paso(output, step_count, verbose) or resultado
+        
+        if not resultado:
+            return "No pude procesar tu consulta. Por favor, intenta reformularla."
+        
+        _guardar_en_cache(clave, resultado, vector)
+        return resultado
+    
+    except Exception as e:
+        return _mensaje_error(e)
+
+
+async def consultar_agente_async(pregunta: str, verbose: bool = False) -> str:
+    """
+    Versión asíncrona de consultar_agente.
+    
+    Las herramientas solicitadas en un mismo turno se ejecutan en paralelo.
+    
+    Args:
+        pregunta: Pregunta del usuario
+        verbose: Si es True, muestra el proceso paso a paso
+    
+    Returns:
+        Respuesta del agente
+    """
+    ruta = _enrutar(pregunta)
+    if ruta is not None:
+        herramienta, argumentos = ruta
+        respuesta = await herramienta.ainvoke(argumentos)
+        if not sin_datos(respuesta):
+            logger.log(_nivel_traza(verbose), "🧭 Respondida sin LLM con: %s", herramienta.name)
+            return respuesta
+        logger.log(_nivel_traza(verbose), "🧭 %s no encontró datos, se consulta al LLM", herramienta.name)
+    
+    clave = _clave_cache(pregunta)
+    respuesta = _buscar_en_cache(clave)
+    if respuesta is not None:
+        logger.log(_nivel_traza(verbose), "💾 Respuesta obtenida de la caché")
+        return respuesta
+    
+    inputs = {"messages": [HumanMessage(content=pregunta)]}
+    
+    resultado = ""
+    step_count = 0
+    
+    try:
+        vector = None
+        if embeddings is not None:
+            vector = _normalizar(await embeddings.aembed_query(pregunta))
+            respuesta = _buscar_en_cache(clave, vector)
+            if respuesta is not None:
+                logger.log(_nivel_traza(verbose), "💾 Respuesta obtenida de la caché semántica")
+                return respuesta
+        
+        async for output in app.astream(inputs):
+            step_count += 1
+            resultado = _procesar_paso(output, step_count, verbose) or resultado
         
         if not resultado:
-            resultado = "No pude procesar tu consulta. Por favor, intenta reformularla."
+            return "No pude procesar tu consulta. Por favor, intenta reformularla."
         
+        _guardar_en_cache(clave, resultado, vector)
         return resultado
     
     except Exception as e:
-        error_msg = str(e)
-        print(f"\n❌ Error completo: {error_msg}")
+        return _mensaje_error(e)
+
+
+async def consultar_agente_stream(pregunta: str) -> AsyncIterator[str]:
+    """
+    Procesa una pregunta y entrega la respuesta a medida que el LLM la genera.
+    
+    Los tokens se entregan apenas llegan, sin esperar a saber si la llamada al
+    LLM termina en una respuesta o en llamadas a herramientas. Si el LLM escribe
+    texto antes de llamar una herramienta, ese texto también se entrega, pero
+    en la caché solo queda la respuesta final (el texto de la última llamada).
+    
+    Args:
+        pregunta: Pregunta del usuario
+    
+    Yields:
+        Fragmentos de texto de la respuesta
+    """
+    ruta = _enrutar(pregunta)
+    if ruta is not None:
+        herramienta, argumentos = ruta
+        respuesta = await herramienta.ainvoke(argumentos)
+        if not sin_datos(respuesta):
+            yield respuesta
+            return
+    
+    clave = _clave_cache(pregunta)
+    respuesta = _buscar_en_cache(clave)
+    if respuesta is not None:
+        yield respuesta
+        return
+    
+    inputs = {"messages": [HumanMessage(content=pregunta)]}
+    
+    # Tokens de la llamada al LLM en curso; al terminar el grafo son los de
+    # la respuesta final. El texto de llamadas anteriores ya se entregó pero
+    # no se guarda en la caché
+    partes = []
+    
+    try:
+        vector = None
+        if embeddings is not None:
+            vector = _normalizar(await embeddings.aembed_query(pregunta))
+            respuesta = _buscar_en_cache(clave, vector)
+            if respuesta is not None:
+                yield respuesta
+                return
+        
+        async for evento in app.astream_events(inputs, version="v2"):
+            if evento["event"] == "on_chat_model_start":
+                partes = []
+            elif evento["event"] == "on_chat_model_stream":
+                token = evento["data"]["chunk"].content
+                if token and isinstance(token, str):
+                    partes.append(token)
+                    yield token
         
-        if "tool" in error_msg.lower() and "role" in error_msg.lower():
-            return (
-                "❌ Error: Problema con el manejo de herramientas. "
-                f"Detalles técnicos: {error_msg}"
-            )
-        return f"❌ Error al procesar la consulta: {error_msg}"
+        if not partes:
+            yield "No pude procesar tu consulta. Por favor, intenta reformularla."
+            return
+        
+        _guardar_en_cache(clave, "".join(partes), vector)
+    
+    except Exception as e:
+        yield _mensaje_error(e)
+
+
+async def consultar_agente_batch(preguntas: list[str], verbose: bool = False) -> list[str]:
+    """
+    Procesa varias preguntas de forma concurrente.
+    
+    Las llamadas al LLM se solapan en lugar de esperar una a una. Las consultas
+    a la base de datos comparten el pool del engine (tools.get_db_engine), que
+    admite hasta pool_size + max_overflow conexiones simultáneas; por encima de
+    eso las herramientas esperan una conexión libre.
+    
+    Args:
+        preguntas: Preguntas del usuario
+        verbose: Si es True, muestra el proceso paso a paso
+    
+    Returns:
+        Respuestas del agente, en el mismo orden que las preguntas
+    """
+    return await asyncio.gather(
+        *(consultar_agente_async(pregunta, verbose=verbose) for pregunta in preguntas)
+    )
 
 
 # ==================== EJEMPLO DE USO ====================
@@ -161,7 +534,7 @@ def consultar_agente(pregunta: str, verbose: bool = False) -> str:
 if __name__ == "__main__":
     print("🤖 Agente de Disponibilidad de Servicios")
     print("=" * 60)
-    print(f"Modelo: {os.getenv('OPENAI_MODEL', 'gpt-4-turbo')}")
+    print(f"Modelo: {settings.openai_model}")
     print("=" * 60)
     
     # Prueba simple primero
@@ -190,9 +563,10 @@ if __name__ == "__main__":
             "Calcula el porcentaje de disponibilidad para Cajeros automáticos"
         ]
         
-        for pregunta in ejemplos:
+        respuestas = asyncio.run(consultar_agente_batch(ejemplos))
+        
+        for pregunta, respuesta in zip(ejemplos, respuestas):
             print(f"\n{'='*60}")
             print(f"👤 Usuario: {pregunta}")
             print("="*60)
-            respuesta = consultar_agente(pregunta, verbose=False)
             print(f"🤖 Agente: {respuesta}")
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Enrutador de preguntas frecuentes
+Identifica preguntas que corresponden directamente a una herramienta para
+resolverlas sin pasar por el LLM
+"""
+import re
+import unicodedata
+
+
+# Patrones anclados: si la pregunta tiene algo más que la petición básica,
+# no coincide y va al LLM
+_RUTAS = [
+    (
+        re.compile(
+            r"^\W*(?:(?:qu[eé]|cu[aá]les)\s+(?:son\s+los\s+)?servicios\s+(?:tenemos|hay|existen)"
+            r"|lista(?:r|me)?\s+(?:los\s+|todos\s+los\s+)?servicios)"
+            r"(?:\s+disponibles)?\W*$",
+            re.IGNORECASE
+        ),
+        'consultar_servicios',
+        lambda match: {}
+    ),
+    (
+        re.compile(
+            r"^\W*calcul(?:a|ar|ame)\s+(?:el\s+porcentaje\s+de\s+|la\s+)?disponibilidad\s+"
+            r"(?:del\s+(?:servicio\s+)?|(?:de|para)\s+(?:el\s+servicio\s+)?)"
+            r"(?P<servicio>[^¿?!.]+?)\W*$",
+            re.IGNORECASE
+        ),
+        'calcular_disponibilidad',
+        lambda match: {"servicio": match.group("servicio")}
+    )
+]
+
+# Las herramientas empiezan con este símbolo cuando no encuentran datos
+# para el servicio pedido
+_PREFIJO_SIN_DATOS = "❌"
+
+# Cifras o comas en la pregunta (fechas, listas de servicios): va al LLM
+_PATRON_COMPLEJO = re.compile(r"\d|,")
+
+# Palabras de fecha o periodo: si aparecen en la pregunta, va al LLM
+_PALABRAS_PERIODO = {
+    'hoy', 'ayer', 'manana', 'semana', 'semanas', 'mes', 'meses', 'ano', 'anos',
+    'trimestre', 'semestre', 'dia', 'dias', 'hora', 'horas',
+    'desde', 'hasta', 'entre', 'durante',
+    'ultimo', 'ultima', 'ultimos', 'ultimas', 'pasado', 'pasada', 'pasados', 'pasadas',
+    'anterior', 'proximo', 'proxima', 'actual', 'este', 'esta', 'estos', 'estas',
+    'enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+    'septiembre', 'setiembre', 'octubre', 'noviembre', 'diciembre',
+    'lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo'
+}
+
+# Palabras que no forman parte de un nombre de servicio: conectores, varias
+# peticiones, cuantificadores o cortesía. Si el nombre capturado tiene
+# alguna, la pregunta va al LLM
+_PALABRAS_VACIAS = {
+    'y', 'e', 'o', 'u', 'ni', 'vs', 'versus', 'ademas', 'tambien', 'con', 'sin',
+    'compara', 'comparar', 'comparado', 'comparacion', 'contra',
+    'todos', 'todas', 'cada', 'cualquier', 'varios', 'varias',
+    'servicio', 'servicios', 'el', 'la', 'los', 'las', 'de', 'del', 'en', 'al',
+    'a', 'por', 'para', 'favor', 'gracias', 'porfa', 'porfavor'
+}
+
+
+def _palabras(texto: str) -> set:
+    """Palabras del texto en minúsculas y sin tildes"""
+    sin_tildes = unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode()
+    return set(re.findall(r"\w+", sin_tildes))
+
+
+def enrutar(pregunta: str):
+    """
+    Busca una herramienta que responda la pregunta sin consultar al LLM.
+
+    Args:
+        pregunta: Pregunta del usuario
+
+    Returns:
+        Tupla (nombre de la herramienta, argumentos), o None si la pregunta
+        debe ir al LLM
+    """
+    if _PATRON_COMPLEJO.search(pregunta) or _palabras(pregunta) & _PALABRAS_PERIODO:
+        return None
+
+    for patron, herramienta, argumentos in _RUTAS:
+        match = patron.match(pregunta.strip())
+        if match:
+            args = argumentos(match)
+            # Solo un nombre de servicio simple, sin calificadores
+            if 'servicio' in args and _palabras(args['servicio']) & _PALABRAS_VACIAS:
+                return None
+            return herramienta, args
+
+    return None
+
+
+def sin_datos(respuesta: str) -> bool:
+    """
+    Indica si la respuesta de una herramienta enrutada no encontró datos.
+
+    El nombre capturado puede incluir palabras que no son del servicio
+    ("ASP excluyendo mantenimientos"); en ese caso la pregunta debe ir al LLM
+    en lugar de entregar el mensaje de la herramienta.
+
+    Args:
+        respuesta: Texto retornado por la herramienta
+
+    Returns:
+        True si la pregunta debe ir al LLM
+    """
+    return respuesta.lstrip().startswith(_PREFIJO_SIN_DATOS)
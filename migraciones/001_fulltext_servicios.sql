@@ -0,0 +1,44 @@
+-- Índices full-text sobre el nombre del servicio
+--
+-- Permiten que las herramientas filtren con CONTAINS(...) en lugar de
+-- LIKE '%...%', que obliga a recorrer la tabla completa. Se activan con
+-- DB_FULLTEXT=yes en el .env una vez creados.
+-- Cada sentencia verifica si el objeto ya existe, así que el script se puede
+-- ejecutar más de una vez.
+--
+-- KEY INDEX debe ser un índice único de una sola columna no nula; ajusta los
+-- nombres PK_* si en tu base de datos son distintos.
+
+USE [DW_DDS];
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'ft_servicios')
+    CREATE FULLTEXT CATALOG ft_servicios;
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.fulltext_indexes
+    WHERE object_id = OBJECT_ID('[dbo].[TblDServicios]')
+)
+    CREATE FULLTEXT INDEX ON [dbo].[TblDServicios]([name])
+        KEY INDEX PK_TblDServicios ON ft_servicios
+        WITH CHANGE_TRACKING AUTO;
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.fulltext_indexes
+    WHERE object_id = OBJECT_ID('[dbo].[TblDPromesaServicio]')
+)
+    CREATE FULLTEXT INDEX ON [dbo].[TblDPromesaServicio]([Servicio])
+        KEY INDEX PK_TblDPromesaServicio ON ft_servicios
+        WITH CHANGE_TRACKING AUTO;
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.fulltext_indexes
+    WHERE object_id = OBJECT_ID('[dbo].[TblHAfectaciones]')
+)
+    CREATE FULLTEXT INDEX ON [dbo].[TblHAfectaciones]([servicio])
+        KEY INDEX PK_TblHAfectaciones ON ft_servicios
+        WITH CHANGE_TRACKING AUTO;
+GO
@@ -0,0 +1,29 @@
+-- Índices de cobertura para las consultas por servicio y rango de fechas
+--
+-- Cubren los filtros (servicio, fecha) de consultar_promesa_servicio,
+-- consultar_afectaciones y calcular_disponibilidad, e incluyen las columnas
+-- que esas herramientas leen, para que SQL Server resuelva las consultas
+-- solo con el índice sin volver a la tabla base.
+
+USE [DW_DDS];
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Promesa_Serv_Fecha'
+    AND object_id = OBJECT_ID('[dbo].[TblDPromesaServicio]')
+)
+    CREATE NONCLUSTERED INDEX IX_Promesa_Serv_Fecha
+        ON [dbo].[TblDPromesaServicio]([Servicio], [fecha])
+        INCLUDE ([minutos_promesa], [dia], [es_festivo]);
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Afect_Serv_FechaIni'
+    AND object_id = OBJECT_ID('[dbo].[TblHAfectaciones]')
+)
+    CREATE NONCLUSTERED INDEX IX_Afect_Serv_FechaIni
+        ON [dbo].[TblHAfectaciones]([servicio], [fecha_hora_ini_afectacion])
+        INCLUDE ([minutos], [fecha_hora_fin_afectacion], [motivo]);
+GO
@@ -0,0 +1,67 @@
+"""
+Configuración del agente leída de variables de entorno (.env)
+Se carga una sola vez y se comparte entre módulos
+"""
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from dotenv import load_dotenv
+
+
+def _env_bool(nombre: str, defecto: str = 'no') -> bool:
+    """Interpreta una variable de entorno como booleano (1/yes/true/si)"""
+    return os.getenv(nombre, defecto).lower() in ('1', 'yes', 'true', 'si')
+
+
+@dataclass(frozen=True)
+class Settings:
+    # OpenAI
+    openai_api_key: str
+    openai_model: str
+    semantic_cache: bool
+    cache_ttl_minutos: int  # Vigencia de las respuestas en caché; 0 la desactiva
+    prewarm: bool  # Hacer una llamada de calentamiento al LLM al importar agente.py
+    log_level: str  # Nivel del logger "agente" (DEBUG, INFO, WARNING...)
+
+    # Base de datos SQL Server
+    db_name: str
+    db_driver: str
+    db_server: str  # Vacío para servidor local con Windows Auth
+    db_trusted_connection: str
+    db_fulltext: bool  # Usar el índice full-text sobre el nombre del servicio (ver migraciones/)
+
+    def connection_string(self) -> str:
+        """
+        Connection string de SQLAlchemy para SQL Server
+        Usa autenticación de Windows por defecto
+        """
+        # Sin servidor: servidor local con autenticación Windows
+        servidor = self.db_server or '@'
+        return (
+            f"mssql+pyodbc://{servidor}/{self.db_name}"
+            f"?driver={self.db_driver}"
+            f"&trusted_connection={self.db_trusted_connection}"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Carga el .env y construye la configuración
+    Las llamadas siguientes retornan la misma instancia
+    """
+    load_dotenv()
+
+    return Settings(
+        openai_api_key=os.getenv('OPENAI_API_KEY'),
+        openai_model=os.getenv('OPENAI_MODEL', 'gpt-4-turbo'),
+        semantic_cache=_env_bool('AGENT_SEMANTIC_CACHE'),
+        cache_ttl_minutos=int(os.getenv('AGENT_CACHE_TTL_MINUTES', '15')),
+        prewarm=_env_bool('AGENT_PREWARM'),
+        log_level=os.getenv('AGENT_LOG_LEVEL', 'INFO').upper(),
+        db_name=os.getenv('DB_NAME', 'DW_DDS'),
+        db_driver=os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server'),
+        db_server=os.getenv('DB_SERVER', ''),
+        db_trusted_connection=os.getenv('DB_TRUSTED_CONNECTION', 'yes'),
+        db_fulltext=_env_bool('DB_FULLTEXT')
+    )
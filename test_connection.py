@@ -3,12 +3,9 @@ Script para probar la conexión a SQL Server usando el mismo método
 que funciona en tu código
 """
 
-import os
-from dotenv import load_dotenv
 import sqlalchemy
 import pandas as pd
-
-load_dotenv()
+from settings import get_settings
 
 def test_connection():
     """Prueba la conexión a SQL Server"""
@@ -17,32 +14,17 @@ def test_connection():
     print("="*60)
     
     # Configuración
-    database = os.getenv('DB_NAME', 'DW_DDS')
-    driver = os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server')
-    server = os.getenv('DB_SERVER', '')
-    trusted = os.getenv('DB_TRUSTED_CONNECTION', 'yes')
+    settings = get_settings()
     
-    print(f"📊 Base de datos: {database}")
-    print(f"🔧 Driver: {driver}")
-    print(f"🖥️  Servidor: {server if server else '(Local con Windows Auth)'}")
-    print(f"🔐 Auth Windows: {trusted}")
+    print(f"📊 Base de datos: {settings.db_name}")
+    print(f"🔧 Driver: {settings.db_driver}")
+    print(f"🖥️  Servidor: {settings.db_server if settings.db_server else '(Local con Windows Auth)'}")
+    print(f"🔐 Auth Windows: {settings.db_trusted_connection}")
     print("="*60)
     
     try:
-        # Construir connection string igual que tu código
-        if server:
-            connection_string = (
-                f"mssql+pyodbc://{server}/{database}"
-                f"?driver={driver}"
-                f"&trusted_connection={trusted}"
-            )
-        else:
-            # Servidor local con autenticación Windows
-            connection_string = (
-                f"mssql+pyodbc://@/{database}"
-                f"?driver={driver}"
-                f"&trusted_connection={trusted}"
-            )
+        # Mismo connection string que usa el agente
+        connection_string = settings.connection_string()
         
         print(f"\n🔗 Connection string:")
         print(f"   {connection_string}")
@@ -56,9 +38,9 @@ def test_connection():
         query_version = "SELECT @@VERSION as version"
         
         with engine.connect() as conexion_SQL:
-            version = pd.read_sql(query_version, conexion_SQL)
+            version = conexion_SQL.execute(sqlalchemy.text(query_version)).scalar_one()
             print(f"✅ Conexión exitosa!")
-            print(f"   Versión: {version.iloc[0]['version'][:80]}...")
+            print(f"   Versión: {version[:80]}...")
         
         # Query de prueba 2: Contar servicios
         print("\n📋 Prueba 2: Contar servicios en TblDServicios")
@@ -68,8 +50,8 @@ def test_connection():
         """
         
         with engine.connect() as conexion_SQL:
-            count = pd.read_sql(query_count, conexion_SQL)
-            print(f"✅ Total de servicios: {count.iloc[0]['total']}")
+            count = conexion_SQL.execute(sqlalchemy.text(query_count)).scalar_one()
+            print(f"✅ Total de servicios: {count}")
         
         # Query de prueba 3: Primeros 5 servicios
         print("\n📋 Prueba 3: Primeros 5 servicios")
@@ -97,9 +79,9 @@ def test_connection():
         """
         
         with engine.connect() as conexion_SQL:
-            promesa = pd.read_sql(query_promesa, conexion_SQL)
-            print(f"✅ Registros de promesa: {promesa.iloc[0]['total']}")
-            print(f"   Rango de fechas: {promesa.iloc[0]['fecha_min']} a {promesa.iloc[0]['fecha_max']}")
+            promesa = conexion_SQL.execute(sqlalchemy.text(query_promesa)).mappings().one()
+            print(f"✅ Registros de promesa: {promesa['total']}")
+            print(f"   Rango de fechas: {promesa['fecha_min']} a {promesa['fecha_max']}")
         
         # Query de prueba 5: Verificar TblHAfectaciones
         print("\n📋 Prueba 5: Verificar TblHAfectaciones")
@@ -111,9 +93,9 @@ def test_connection():
         """
         
         with engine.connect() as conexion_SQL:
-            afectaciones = pd.read_sql(query_afectaciones, conexion_SQL)
-            print(f"✅ Registros de afectaciones: {afectaciones.iloc[0]['total']}")
-            print(f"   Rango de fechas: {afectaciones.iloc[0]['fecha_min']} a {afectaciones.iloc[0]['fecha_max']}")
+            afectaciones = conexion_SQL.execute(sqlalchemy.text(query_afectaciones)).mappings().one()
+            print(f"✅ Registros de afectaciones: {afectaciones['total']}")
+            print(f"   Rango de fechas: {afectaciones['fecha_min']} a {afectaciones['fecha_max']}")
         
         print("\n" + "="*60)
         print("✅ TODAS LAS PRUEBAS EXITOSAS")
@@ -0,0 +1,93 @@
+"""
+Pruebas del enrutador de preguntas frecuentes
+"""
+import unittest
+
+from enrutador import enrutar, sin_datos
+
+
+class TestEnrutar(unittest.TestCase):
+
+    def test_listar_servicios(self):
+        for pregunta in [
+            "¿Qué servicios tenemos disponibles?",
+            "¿Qué servicios hay?",
+            "lista los servicios",
+            "Listame todos los servicios disponibles"
+        ]:
+            with self.subTest(pregunta=pregunta):
+                self.assertEqual(enrutar(pregunta), ('consultar_servicios', {}))
+
+    def test_calcular_disponibilidad(self):
+        casos = {
+            "Calcula el porcentaje de disponibilidad para Cajeros automáticos": "Cajeros automáticos",
+            "Calcula la disponibilidad de ASP": "ASP",
+            "calcula la disponibilidad del servicio App Bancolombia": "App Bancolombia",
+            "Calcular disponibilidad para el servicio PSE?": "PSE"
+        }
+        for pregunta, servicio in casos.items():
+            with self.subTest(pregunta=pregunta):
+                self.assertEqual(
+                    enrutar(pregunta),
+                    ('calcular_disponibilidad', {'servicio': servicio})
+                )
+
+    def test_periodos_van_al_llm(self):
+        for pregunta in [
+            "Calcula la disponibilidad de ASP en enero",
+            "Calcula la disponibilidad de ASP este trimestre",
+            "Calcula la disponibilidad de ASP el lunes pasado",
+            "Calcula la disponibilidad de ASP durante marzo",
+            "Calcula la disponibilidad para ASP el 2024-12-10",
+            "¿Cuál es la disponibilidad del servicio ASP hoy?",
+            "¿Qué servicios hay este mes?"
+        ]:
+            with self.subTest(pregunta=pregunta):
+                self.assertIsNone(enrutar(pregunta))
+
+    def test_calificadores_van_al_llm(self):
+        for pregunta in [
+            "Calcula la disponibilidad de ASP por favor",
+            "Calcula la disponibilidad de ASP o PSE",
+            "Calcula la disponibilidad de ASP, y ATM",
+            "Calcula la disponibilidad de ASP y muestra sus afectaciones",
+            "Calcula la disponibilidad de todos los servicios",
+            "Calcula la disponibilidad de cada servicio"
+        ]:
+            with self.subTest(pregunta=pregunta):
+                self.assertIsNone(enrutar(pregunta))
+
+    def test_otras_preguntas_van_al_llm(self):
+        for pregunta in [
+            "Muéstrame las afectaciones del servicio App Bancolombia en los últimos 7 días",
+            "¿Qué servicios disponibles tienen afectaciones?",
+            "¿Qué servicio tuvo más afectaciones?"
+        ]:
+            with self.subTest(pregunta=pregunta):
+                self.assertIsNone(enrutar(pregunta))
+
+
+class TestSinDatos(unittest.TestCase):
+
+    def test_nombre_con_palabras_extra_va_al_llm(self):
+        # El enrutador no reconoce "excluyendo mantenimientos" como calificador;
+        # la herramienta no encuentra ese servicio y la pregunta pasa al LLM
+        herramienta, args = enrutar("Calcula la disponibilidad de ASP excluyendo mantenimientos")
+        self.assertEqual(herramienta, 'calcular_disponibilidad')
+        respuesta = (
+            f"❌ No hay promesa de servicio registrada para '{args['servicio']}' "
+            "en el período 2026-01-01 a 2026-10-15."
+        )
+        self.assertTrue(sin_datos(respuesta))
+
+    def test_respuesta_con_datos_se_entrega(self):
+        for respuesta in [
+            "📈 Análisis de Disponibilidad para 'ASP'\nPeríodo: 2026-01-01 a 2026-10-15\n",
+            "Se encontraron 3 servicio(s):\n\n📋 Servicio: ASP\n"
+        ]:
+            with self.subTest(respuesta=respuesta):
+                self.assertFalse(sin_datos(respuesta))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,70 +1,243 @@
 from langchain_core.tools import tool
-from datetime import datetime
-from dotenv import load_dotenv
-import os
-import sqlalchemy
-import pandas as pd
-
-# Cargar variables de entorno
-load_dotenv()
-
-# Configuración de base de datos SQL Server usando SQLAlchemy
-DB_CONFIG = {
-    'database': os.getenv('DB_NAME', 'DW_DDS'),
-    'driver': os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server'),
-    'server': os.getenv('DB_SERVER', ''),  # Vacío para servidor local con Windows Auth
-    'trusted_connection': os.getenv('DB_TRUSTED_CONNECTION', 'yes')
-}
+from datetime import date, datetime
+from functools import lru_cache
+from settings import get_settings
+
+# sqlalchemy se importa dentro de las funciones que lo usan: las preguntas
+# que responde la caché del agente no pagan su importación
+
 
+@lru_cache(maxsize=1)
 def get_db_engine():
     """
     Crea el engine de SQLAlchemy para SQL Server
     Usa autenticación de Windows por defecto
+
+    El engine se construye una sola vez y se reutiliza entre llamadas,
+    de modo que las herramientas comparten el mismo pool de conexiones.
     """
-    if DB_CONFIG['server']:
-        # Si hay servidor especificado
-        connection_string = (
-            f"mssql+pyodbc://{DB_CONFIG['server']}/{DB_CONFIG['database']}"
-            f"?driver={DB_CONFIG['driver']}"
-            f"&trusted_connection={DB_CONFIG['trusted_connection']}"
-        )
-    else:
-        # Servidor local con autenticación Windows (como tu ejemplo)
-        connection_string = (
-            f"mssql+pyodbc://@/{DB_CONFIG['database']}"
-            f"?driver={DB_CONFIG['driver']}"
-            f"&trusted_connection={DB_CONFIG['trusted_connection']}"
-        )
+    import sqlalchemy
     
-    return sqlalchemy.create_engine(connection_string)
+    return sqlalchemy.create_engine(
+        get_settings().connection_string(),
+        pool_size=8,
+        max_overflow=4,
+        pool_pre_ping=True,
+        # Renovar conexiones antes de que el servidor o la red las corten
+        pool_recycle=1800,
+        # Reusar la conexión devuelta más recientemente (la más "caliente")
+        pool_use_lifo=True,
+        # Las herramientas solo leen: sin transacción abierta por consulta
+        isolation_level="AUTOCOMMIT",
+        fast_executemany=True
+    )
+
+
+def dispose_engine():
+    """
+    Cierra las conexiones del pool y descarta el engine en caché
+    """
+    if get_db_engine.cache_info().currsize:
+        get_db_engine().dispose()
+    get_db_engine.cache_clear()
 
 
 def ejecutar_query(query, params=None):
     """
-    Ejecuta una query y retorna un DataFrame de pandas
+    Ejecuta una query y retorna sus filas
     
     Args:
         query: Query SQL a ejecutar
         params: Parámetros para la query (opcional)
     
     Returns:
-        DataFrame con los resultados
+        Lista de diccionarios (columna -> valor), uno por fila
     """
+    from sqlalchemy import text
     engine = get_db_engine()
     
     try:
         with engine.connect() as conexion_SQL:
-            if params:
-                # Si hay parámetros, usar text() de sqlalchemy
-                from sqlalchemy import text
-                resultado = pd.read_sql(text(query), conexion_SQL, params=params)
-            else:
-                resultado = pd.read_sql(query, conexion_SQL)
-        return resultado
+            # Siempre text() con un dict de parámetros, para que el texto
+            # enviado al driver sea idéntico entre llamadas
+            resultado = conexion_SQL.execute(text(query), params or {}).mappings().all()
+        return [dict(fila) for fila in resultado]
     except Exception as e:
         raise Exception(f"Error al conectarse a la base de datos: {str(e)}")
 
 
+
+def ejecutar_fila(query, params=None):
+    """
+    Ejecuta una query que retorna exactamente una fila
+    
+    Args:
+        query: Query SQL a ejecutar
+        params: Parámetros para la query (opcional)
+    
+    Returns:
+        Fila con acceso por nombre de columna
+    """
+    from sqlalchemy import text
+    engine = get_db_engine()
+    
+    try:
+        with engine.connect() as conexion_SQL:
+            return conexion_SQL.execute(text(query), params or {}).mappings().one()
+    except Exception as e:
+        raise Exception(f"Error al conectarse a la base de datos: {str(e)}")
+
+
+# ==================== QUERIES ====================
+# Textos constantes con nombres de parámetros fijos: al repetirse idénticos
+# entre llamadas, el driver ODBC puede reutilizar el statement preparado.
+# Los índices que usan estas queries están en migraciones/.
+
+# Filtros por nombre de servicio. Las queries que filtran por servicio se
+# generan una vez por filtro: 'like' (subcadena, recorre la tabla) y
+# 'fulltext' (prefijo de palabra, usa el índice full-text)
+_FILTROS_SERVICIO = {
+    'like': "{columna} LIKE :servicio",
+    'fulltext': "CONTAINS({columna}, :servicio)"
+}
+
+# Términos más cortos que esto siguen usando LIKE
+_MIN_CARACTERES_FULLTEXT = 3
+
+
+def _queries_por_filtro(plantilla, **columnas):
+    """
+    Genera una variante de la query por cada filtro de servicio
+    
+    Args:
+        plantilla: Query con un marcador por cada filtro ({filtro}, ...)
+        columnas: Columna a filtrar para cada marcador
+    
+    Returns:
+        Diccionario modo -> query
+    """
+    return {
+        modo: plantilla.format(**{
+            marcador: filtro.format(columna=columna)
+            for marcador, columna in columnas.items()
+        })
+        for modo, filtro in _FILTROS_SERVICIO.items()
+    }
+
+
+def _filtro_servicio(servicio):
+    """
+    Elige el filtro de servicio y arma el valor del parámetro :servicio
+    
+    Returns:
+        Tupla (modo, valor) con modo 'like' o 'fulltext'
+    """
+    termino = servicio.strip()
+    if get_settings().db_fulltext and len(termino) >= _MIN_CARACTERES_FULLTEXT:
+        # Término de prefijo: "app banco*" coincide con "App Bancolombia"
+        termino = termino.replace('"', '""')
+        return 'fulltext', f'"{termino}*"'
+    return 'like', f'%{servicio}%'
+
+
+_Q_SERVICIOS = """
+    SELECT TOP 20 
+        [Instanceid],
+        [IddServicio],
+        [is_spacial_service],
+        [is_key_channel],
+        [name],
+        [sla]
+    FROM [DW_DDS].[dbo].[TblDServicios]
+"""
+
+_Q_SERVICIOS_POR_NOMBRE = _queries_por_filtro("""
+    SELECT TOP 10 
+        [Instanceid],
+        [IddServicio],
+        [is_spacial_service],
+        [is_key_channel],
+        [name],
+        [sla]
+    FROM [DW_DDS].[dbo].[TblDServicios]
+    WHERE {filtro}
+""", filtro='[name]')
+
+# Últimos registros, con totales del rango completo calculados en SQL.
+# Solo las columnas que usan las herramientas, todas cubiertas por los
+# índices de migraciones/002_indices_disponibilidad.sql
+_Q_PROMESA = _queries_por_filtro("""
+    SELECT TOP 5
+        [fecha],
+        [dia],
+        [es_festivo],
+        [minutos_promesa],
+        SUM([minutos_promesa]) OVER () as total_minutos_promesa,
+        COUNT(*) OVER () as total_registros
+    FROM [DW_DDS].[dbo].[TblDPromesaServicio] 
+    WHERE {filtro}
+    AND [fecha] BETWEEN :fechaINI AND :fechaFIN
+    ORDER BY [fecha] DESC
+""", filtro='[Servicio]')
+
+_Q_AFECTACIONES = _queries_por_filtro("""
+    SELECT TOP 10
+        [fecha_hora_ini_afectacion],
+        [fecha_hora_fin_afectacion],
+        [minutos],
+        [motivo],
+        SUM([minutos]) OVER () as total_minutos_afectacion,
+        COUNT(*) OVER () as total_registros
+    FROM [DW_DDS].[dbo].[TblHAfectaciones] 
+    WHERE {filtro}
+    AND [fecha_hora_ini_afectacion] BETWEEN :fechaINI AND :fechaFIN
+    ORDER BY [fecha_hora_ini_afectacion] DESC
+""", filtro='[servicio]')
+
+# Promesa y afectaciones en una sola consulta
+_Q_DISPONIBILIDAD = _queries_por_filtro("""
+    SELECT
+        (
+            SELECT SUM([minutos_promesa])
+            FROM [DW_DDS].[dbo].[TblDPromesaServicio]
+            WHERE {filtro_promesa}
+            AND [fecha] BETWEEN :fechaINI AND :fechaFIN
+        ) as minutos_promesa,
+        (
+            SELECT ISNULL(SUM([minutos]), 0)
+            FROM [DW_DDS].[dbo].[TblHAfectaciones]
+            WHERE {filtro_afectacion}
+            AND [fecha_hora_ini_afectacion] BETWEEN :fechaINI AND :fechaFIN
+        ) as total_afectacion
+""", filtro_promesa='[Servicio]', filtro_afectacion='[servicio]')
+
+
+def _formatear_minutos(minutos):
+    """
+    Formatea minutos con separador de miles; N/A si el valor es NULL
+    (por ejemplo, una afectación abierta que aún no tiene minutos)
+    """
+    return "N/A" if minutos is None else f"{minutos:,.0f}"
+
+
+def _rango_fechas(fecha_inicio, fecha_fin):
+    """
+    Convierte el rango de fechas recibido por una herramienta a objetos date,
+    que el driver envía como fechas nativas sin conversión en SQL Server
+    
+    Args:
+        fecha_inicio: Fecha inicial en formato YYYY-MM-DD (opcional)
+        fecha_fin: Fecha final en formato YYYY-MM-DD (opcional)
+    
+    Returns:
+        Tupla (inicio, fin). Sin fecha final, termina hoy; sin fecha inicial,
+        empieza el primer día del año de la fecha final
+    """
+    fin = datetime.strptime(fecha_fin, '%Y-%m-%d').date() if fecha_fin else date.today()
+    inicio = datetime.strptime(fecha_inicio, '%Y-%m-%d').date() if fecha_inicio else date(fin.year, 1, 1)
+    return inicio, fin
+
+
 # ==================== HERRAMIENTAS ====================
 
 @tool
@@ -80,47 +253,26 @@ def consultar_servicios(servicio: str = None) -> str:
     """
     try:
         if servicio:
-            query = """
-                SELECT TOP 10 
-                    [Instanceid],
-                    [IddServicio],
-                    [is_spacial_service],
-                    [is_key_channel],
-                    [name],
-                    [sla]
-                FROM [DW_DDS].[dbo].[TblDServicios]
-                WHERE [name] LIKE :servicio
-            """
-            params = {'servicio': f'%{servicio}%'}
-            servicios = ejecutar_query(query, params)
+            modo, patron = _filtro_servicio(servicio)
+            servicios = ejecutar_query(_Q_SERVICIOS_POR_NOMBRE[modo], {'servicio': patron})
         else:
-            query = """
-                SELECT TOP 20 
-                    [Instanceid],
-                    [IddServicio],
-                    [is_spacial_service],
-                    [is_key_channel],
-                    [name],
-                    [sla]
-                FROM [DW_DDS].[dbo].[TblDServicios]
-            """
-            servicios = ejecutar_query(query)
+            servicios = ejecutar_query(_Q_SERVICIOS)
         
-        if servicios.empty:
+        if not servicios:
             return f"No se encontraron servicios{' con nombre similar a: ' + servicio if servicio else ''}."
         
-        resultado = f"Se encontraron {len(servicios)} servicio(s):\n\n"
+        partes = [f"Se encontraron {len(servicios)} servicio(s):\n\n"]
         
-        for idx, row in servicios.iterrows():
-            resultado += f"📋 Servicio: {row['name']}\n"
-            resultado += f"   InstanceID: {row['Instanceid']}\n"
-            resultado += f"   ID Servicio: {row['IddServicio']}\n"
-            resultado += f"   SLA: {row['sla']}%\n"
-            resultado += f"   Servicio Especial: {'Sí' if row['is_spacial_service'] else 'No'}\n"
-            resultado += f"   Canal Clave: {'Sí' if row['is_key_channel'] else 'No'}\n"
-            resultado += "\n"
+        for row in servicios:
+            partes.append(f"📋 Servicio: {row['name']}\n")
+            partes.append(f"   InstanceID: {row['Instanceid']}\n")
+            partes.append(f"   ID Servicio: {row['IddServicio']}\n")
+            partes.append(f"   SLA: {row['sla']}%\n")
+            partes.append(f"   Servicio Especial: {'Sí' if row['is_spacial_service'] else 'No'}\n")
+            partes.append(f"   Canal Clave: {'Sí' if row['is_key_channel'] else 'No'}\n")
+            partes.append("\n")
         
-        return resultado
+        return "".join(partes)
     
     except Exception as e:
         return f"Error al consultar servicios: {str(e)}"
@@ -140,47 +292,38 @@ def consultar_promesa_servicio(servicio: str, fechaINI: str = None, fechaFIN: st
         Información de promesa de servicio con minutos prometidos
     """
     try:
-        if not fechaINI:
-            # Definir fechaINI como el primer día del año en curso
-            fechaINI = datetime(datetime.now().year, 1, 1).strftime('%Y-%m-%d')
-            fechaFIN = datetime.now().strftime('%Y-%m-%d')
-        
-        query = """
-            SELECT TOP 100 * 
-            FROM [DW_DDS].[dbo].[TblDPromesaServicio] 
-            WHERE [Servicio] LIKE :servicio
-            AND [fecha] BETWEEN :fechaINI AND :fechaFIN
-            ORDER BY [fecha] DESC
-        """
+        fechaINI, fechaFIN = _rango_fechas(fechaINI, fechaFIN)
         
+        modo, patron = _filtro_servicio(servicio)
         params = {
-            'servicio': f'%{servicio}%',
+            'servicio': patron,
             'fechaINI': fechaINI,
             'fechaFIN': fechaFIN
         }
         
-        promesas = ejecutar_query(query, params)
+        promesas = ejecutar_query(_Q_PROMESA[modo], params)
         
-        if promesas.empty:
+        if not promesas:
             return f"No se encontró promesa de servicio para '{servicio}' entre {fechaINI} y {fechaFIN}."
         
-        # Calcular totales
-        total_minutos_promesa = promesas['minutos_promesa'].sum()
+        # Totales del rango completo (calculados por la query)
+        total_minutos_promesa = promesas[0]['total_minutos_promesa'] or 0
+        total_registros = promesas[0]['total_registros']
         
-        resultado = f"📊 Promesa de servicio para '{servicio}' ({fechaINI} a {fechaFIN}):\n\n"
-        resultado += f"Total de días registrados: {len(promesas)}\n"
-        resultado += f"Total minutos prometidos: {total_minutos_promesa:,.0f}\n"
-        resultado += f"Promedio diario: {total_minutos_promesa / len(promesas):.0f} minutos\n\n"
+        partes = [f"📊 Promesa de servicio para '{servicio}' ({fechaINI} a {fechaFIN}):\n\n"]
+        partes.append(f"Total de días registrados: {total_registros}\n")
+        partes.append(f"Total minutos prometidos: {total_minutos_promesa:,.0f}\n")
+        partes.append(f"Promedio diario: {total_minutos_promesa / total_registros:.0f} minutos\n\n")
         
         # Mostrar algunos ejemplos
-        resultado += "Últimos registros:\n"
-        for idx, row in promesas.head(5).iterrows():
-            resultado += f"{idx + 1}. Fecha: {row['fecha']}\n"
-            resultado += f"   Día: {row.get('dia', 'N/A')}\n"
-            resultado += f"   Festivo: {'Sí' if row.get('es_festivo') else 'No'}\n"
-            resultado += f"   Minutos: {row['minutos_promesa']:,.0f}\n\n"
-        
-        return resultado
+        partes.append("Últimos registros:\n")
+        for idx, row in enumerate(promesas, start=1):
+            partes.append(f"{idx}. Fecha: {row['fecha']}\n")
+            partes.append(f"   Día: {row['dia'] or 'N/A'}\n")
+            partes.append(f"   Festivo: {'Sí' if row['es_festivo'] else 'No'}\n")
+            partes.append(f"   Minutos: {_formatear_minutos(row['minutos_promesa'])}\n\n")
+        
+        return "".join(partes)
     
     except Exception as e:
         return f"Error al consultar promesa de servicio: {str(e)}"
@@ -200,54 +343,46 @@ def consultar_afectaciones(servicio: str, fecha_inicio: str = None, fecha_fin: s
         Información de afectaciones con tiempos de caída
     """
     try:
-        if not fecha_inicio:
-            # Definir fecha_inicio como el primer día del año en curso
-            fecha_inicio = datetime(datetime.now().year, 1, 1).strftime('%Y-%m-%d')
-            fecha_fin = datetime.now().strftime('%Y-%m-%d')
-        
-        query = """
-            SELECT TOP 100 * 
-            FROM [DW_DDS].[dbo].[TblHAfectaciones] 
-            WHERE [servicio] LIKE :servicio
-            AND [fecha_hora_ini_afectacion] BETWEEN :fecha_inicio AND :fecha_fin
-            ORDER BY [fecha_hora_ini_afectacion] DESC
-        """
+        fecha_inicio, fecha_fin = _rango_fechas(fecha_inicio, fecha_fin)
         
+        modo, patron = _filtro_servicio(servicio)
         params = {
-            'servicio': f'%{servicio}%',
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin
+            'servicio': patron,
+            'fechaINI': fecha_inicio,
+            'fechaFIN': fecha_fin
         }
         
-        afectaciones = ejecutar_query(query, params)
+        afectaciones = ejecutar_query(_Q_AFECTACIONES[modo], params)
         
-        if afectaciones.empty:
+        if not afectaciones:
             return f"✅ No se encontraron afectaciones para '{servicio}' entre {fecha_inicio} y {fecha_fin}."
         
-        total_minutos = afectaciones['minutos'].sum()
+        # Totales del rango completo (calculados por la query)
+        total_minutos = afectaciones[0]['total_minutos_afectacion'] or 0
+        total_registros = afectaciones[0]['total_registros']
         
-        resultado = f"⚠️ Afectaciones para '{servicio}' ({fecha_inicio} a {fecha_fin}):\n\n"
-        resultado += f"Total de afectaciones: {len(afectaciones)}\n"
-        resultado += f"Total minutos afectados: {total_minutos:,.0f}\n"
-        resultado += f"Promedio por afectación: {total_minutos / len(afectaciones):.1f} minutos\n\n"
+        partes = [f"⚠️ Afectaciones para '{servicio}' ({fecha_inicio} a {fecha_fin}):\n\n"]
+        partes.append(f"Total de afectaciones: {total_registros}\n")
+        partes.append(f"Total minutos afectados: {total_minutos:,.0f}\n")
+        partes.append(f"Promedio por afectación: {total_minutos / total_registros:.1f} minutos\n\n")
         
         # Mostrar las afectaciones más recientes
-        resultado += "Últimas afectaciones:\n"
-        for idx, row in afectaciones.head(10).iterrows():
-            resultado += f"{idx + 1}. Inicio: {row['fecha_hora_ini_afectacion']}\n"
-            resultado += f"   Fin: {row['fecha_hora_fin_afectacion']}\n"
-            resultado += f"   Minutos: {row['minutos']:,.0f}\n"
+        partes.append("Últimas afectaciones:\n")
+        for idx, row in enumerate(afectaciones, start=1):
+            partes.append(f"{idx}. Inicio: {row['fecha_hora_ini_afectacion']}\n")
+            partes.append(f"   Fin: {row['fecha_hora_fin_afectacion']}\n")
+            partes.append(f"   Minutos: {_formatear_minutos(row['minutos'])}\n")
             
             # Agregar motivo si existe
-            if pd.notna(row.get('motivo')):
-                resultado += f"   Motivo: {row['motivo']}\n"
+            if row['motivo'] is not None:
+                partes.append(f"   Motivo: {row['motivo']}\n")
             
-            resultado += "\n"
+            partes.append("\n")
         
-        if len(afectaciones) > 10:
-            resultado += f"... y {len(afectaciones) - 10} afectaciones más.\n"
+        if total_registros > len(afectaciones):
+            partes.append(f"... y {total_registros - len(afectaciones)} afectaciones más.\n")
         
-        return resultado
+        return "".join(partes)
     
     except Exception as e:
         return f"Error al consultar afectaciones: {str(e)}"
@@ -267,84 +402,58 @@ def calcular_disponibilidad(servicio: str, fechaINI: str = None, fechaFIN: str =
         Porcentaje de disponibilidad y análisis comparativo
     """
     try:
-        if not fechaINI:
-            # Definir fechaINI como el primer día del año en curso
-            fechaINI = datetime(datetime.now().year, 1, 1).strftime('%Y-%m-%d')
-            fechaFIN = datetime.now().strftime('%Y-%m-%d')
+        fechaINI, fechaFIN = _rango_fechas(fechaINI, fechaFIN)
         
-        # Obtener promesa
-        query_promesa = """
-            SELECT SUM([minutos_promesa]) as minutos_promesa 
-            FROM [DW_DDS].[dbo].[TblDPromesaServicio]
-            WHERE [Servicio] LIKE :servicio
-            AND [fecha] BETWEEN :fechaINI AND :fechaFIN
-        """
-        
-        params_promesa = {
-            'servicio': f'%{servicio}%',
+        modo, patron = _filtro_servicio(servicio)
+        params = {
+            'servicio': patron,
             'fechaINI': fechaINI,
             'fechaFIN': fechaFIN
         }
         
-        promesa_df = ejecutar_query(query_promesa, params_promesa)
+        # Obtener promesa y afectaciones en una sola consulta
+        fila = ejecutar_fila(_Q_DISPONIBILIDAD[modo], params)
         
-        if promesa_df.empty or pd.isna(promesa_df.iloc[0]['minutos_promesa']):
+        # Minutos enteros directamente de la fila; NULL (sin promesa) o 0
+        # no permiten calcular un porcentaje
+        minutos_promesa = int(fila['minutos_promesa'] or 0)
+        if not minutos_promesa:
             return f"❌ No hay promesa de servicio registrada para '{servicio}' en el período {fechaINI} a {fechaFIN}."
         
-        minutos_promesa = float(promesa_df.iloc[0]['minutos_promesa'])
-        
-        # Obtener afectaciones
-        query_afectaciones = """
-            SELECT ISNULL(SUM([minutos]), 0) as total_afectacion
-            FROM [DW_DDS].[dbo].[TblHAfectaciones]
-            WHERE [servicio] LIKE :servicio
-            AND [fecha_hora_ini_afectacion] BETWEEN :fechaINI AND :fechaFIN
-        """
-        
-        params_afectaciones = {
-            'servicio': f'%{servicio}%',
-            'fechaINI': fechaINI,
-            'fechaFIN': fechaFIN
-        }
-        
-        afectacion_df = ejecutar_query(query_afectaciones, params_afectaciones)
-        
-        minutos_afectacion = float(afectacion_df.iloc[0]['total_afectacion']) if not afectacion_df.empty else 0
+        minutos_afectacion = int(fila['total_afectacion'])
         minutos_disponibles = minutos_promesa - minutos_afectacion
         
-        if minutos_promesa > 0:
-            porcentaje = (minutos_disponibles / minutos_promesa) * 100
-        else:
-            porcentaje = 0
+        # Porcentaje con 4 decimales calculado en aritmética entera
+        porcentaje = (minutos_disponibles * 1_000_000 // minutos_promesa) / 10_000
         
         # Calcular días y horas para mejor legibilidad
         dias_promesa = minutos_promesa / 1440
         horas_afectacion = minutos_afectacion / 60
         
-        resultado = f"📈 Análisis de Disponibilidad para '{servicio}'\n"
-        resultado += f"Período: {fechaINI} a {fechaFIN}\n"
-        resultado += f"{'='*60}\n\n"
+        partes = [f"📈 Análisis de Disponibilidad para '{servicio}'\n"]
+        partes.append(f"Período: {fechaINI} a {fechaFIN}\n")
+        partes.append(f"{'='*60}\n\n")
         
-        resultado += f"📊 Minutos prometidos: {minutos_promesa:,.0f} ({dias_promesa:.1f} días)\n"
-        resultado += f"⚠️  Minutos afectados: {minutos_afectacion:,.0f} ({horas_afectacion:.1f} horas)\n"
-        resultado += f"✅ Minutos disponibles: {minutos_disponibles:,.0f}\n\n"
+        partes.append(f"📊 Minutos prometidos: {minutos_promesa:,.0f} ({dias_promesa:.1f} días)\n")
+        partes.append(f"⚠️  Minutos afectados: {minutos_afectacion:,.0f} ({horas_afectacion:.1f} horas)\n")
+        partes.append(f"✅ Minutos disponibles: {minutos_disponibles:,.0f}\n\n")
         
-        resultado += f"🎯 DISPONIBILIDAD: {porcentaje:.4f}%\n\n"
+        partes.append(f"🎯 DISPONIBILIDAD: {porcentaje:.4f}%\n\n")
         
         if porcentaje >= 99.9:
-            resultado += "Estado: ✅ EXCELENTE - Cumple SLA\n"
-            resultado += "El servicio está operando dentro de los parámetros óptimos."
+            partes.append("Estado: ✅ EXCELENTE - Cumple SLA\n")
+            partes.append("El servicio está operando dentro de los parámetros óptimos.")
         elif porcentaje >= 99.0:
-            resultado += "Estado: ✔️  BUENO - Dentro de límites aceptables\n"
-            resultado += "El servicio cumple con los estándares mínimos."
+            partes.append("Estado: ✔️  BUENO - Dentro de límites aceptables\n")
+            partes.append("El servicio cumple con los estándares mínimos.")
         elif porcentaje >= 95.0:
-            resultado += "Estado: ⚠️  REGULAR - Requiere atención\n"
-            resultado += "Se recomienda revisar las causas de las afectaciones."
+            partes.append("Estado: ⚠️  REGULAR - Requiere atención\n")
+            partes.append("Se recomienda revisar las causas de las afectaciones.")
         else:
-            resultado += "Estado: ❌ CRÍTICO - SLA comprometido\n"
-            resultado += "Se requiere acción inmediata para mejorar la disponibilidad."
+            partes.append("Estado: ❌ CRÍTICO - SLA comprometido\n")
+            partes.append("Se requiere acción inmediata para mejorar la disponibilidad.")
         
-        return resultado
+        return "".join(partes)
     
     except Exception as e:
         return f"Error al calcular disponibilidad: {str(e)}"
\ No newline at end of file